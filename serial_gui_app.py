@@ -7,15 +7,27 @@ selecting lines, and sending them individually.
 
 import tkinter as tk
 from tkinter import ttk, messagebox, scrolledtext, filedialog
-import serial
-import serial.tools.list_ports
 import threading
-from queue import Queue
-import shelve
+import codecs
+from collections import deque
+import json
 import os
 
 
 class SerialGUIApp:
+    # Maximum number of lines kept in the serial output widget
+    MAX_OUTPUT_LINES = 5000
+    # Maximum number of serial reads waiting to be shown
+    MAX_QUEUED_CHUNKS = 1024
+    # Prefix added to every line sent in Berry mode, and the line terminator
+    _BR_PREFIX = b"br "
+    _NL = b"\n"
+    # Keys whose release can move the cursor to another line
+    _LINE_KEYS = ("Up", "Down", "Left", "Right", "Prior", "Next",
+                  "Home", "End", "Return", "KP_Enter", "BackSpace")
+    # Edits that can join, split or move lines without the cursor line changing
+    _EDIT_EVENTS = ("<KeyRelease-Delete>", "<<Paste>>", "<<Cut>>", "<<Undo>>", "<<Redo>>")
+
     def __init__(self, root):
         self.root = root
         self.root.title("Serial Port GUI Application")
@@ -23,23 +35,41 @@ class SerialGUIApp:
         
         # Serial port connection
         self.ser = None
-        self.running = False
-        self.queue = Queue()
+        # Reader -> GUI fragments; bounded so the oldest data is dropped if the GUI falls behind
+        self.queue = deque(maxlen=self.MAX_QUEUED_CHUNKS)
         self.reader_thread = None
+        self._drain_pending = False  # A <<SerialData>> event is already on its way
+        # Keeps partial UTF-8 sequences between drains; a trailing '\r' is held back
+        # in case its '\n' arrives with the next read
+        self._decoder = codecs.getincrementaldecoder('utf-8')(errors='replace')
+        self._held_cr = ""
+        self._connecting = False  # An opener thread is in flight
+        self._open_results = deque()  # (ser, port, baud) or error text from opener threads
+        self._close_error = None
+        self._ports_result = ()  # Latest port list from the enumeration thread
+        self._ports_error = None  # Error text if the enumeration thread failed
+        self._last_ports = None  # Port list currently shown in the combobox
+        self._auto_connect_pending = True  # Auto-connect once the first port list arrives
         self.berry_mode = False  # Track if Berry mode is active
+        self._active_widget = None  # Text widget of the selected tab
+        self._widgets_ready = False  # Set once create_widgets has built the UI
         
-        # Initialize shelve for persistent storage
-        self.config_db = shelve.open(os.path.join(os.path.dirname(__file__), 'serial_config'))
+        # Load persistent settings
+        self._config_path = os.path.join(os.path.dirname(__file__), 'serial_config.json')
+        self.config = self._load_config()
         
         # Create UI
         self.create_widgets()
-        self.populate_ports()
         
-        # Try to auto-connect with saved settings
-        self.root.after(500, self.auto_connect)
+        # Worker threads report back to the GUI thread through virtual events
+        self.root.bind("<<SerialData>>", self._drain_queue)
+        self.root.bind("<<SerialConnected>>", self._on_connected)
+        self.root.bind("<<SerialConnectFailed>>", self._on_connect_failed)
+        self.root.bind("<<SerialCloseFailed>>", self._on_close_failed)
+        self.root.bind("<<PortsListed>>", self._apply_ports)
         
-        # Start monitoring queue
-        self.monitor_queue()
+        # Auto-connect with saved settings runs once these ports are listed
+        self.populate_ports()
     
     def create_widgets(self):
         """Create all UI widgets"""
@@ -89,9 +119,12 @@ class SerialGUIApp:
                                                      wrap=tk.WORD)
         self.text_widget.pack(fill=tk.BOTH, expand=True)
         self.text_widget.bind("<Control-Return>", self.send_line_at_cursor)
-        self.text_widget.bind("<KeyRelease>", self._on_cursor_move)
+        self.text_widget.bind("<KeyRelease>", self._on_key_typed)
+        for key in self._LINE_KEYS:
+            self.text_widget.bind(f"<KeyRelease-{key}>", self._on_cursor_move)
         self.text_widget.bind("<ButtonRelease-1>", self._on_cursor_move)
-        self.text_widget.bind("<Motion>", self._on_cursor_move)
+        for sequence in self._EDIT_EVENTS:
+            self.text_widget.bind(sequence, self._on_text_edit)
         
         # Berry mode tab
         berry_frame = ttk.Frame(self.notebook)
@@ -101,9 +134,16 @@ class SerialGUIApp:
                                                            wrap=tk.WORD)
         self.text_widget_berry.pack(fill=tk.BOTH, expand=True)
         self.text_widget_berry.bind("<Control-Return>", self.send_line_at_cursor)
-        self.text_widget_berry.bind("<KeyRelease>", self._on_cursor_move)
+        self.text_widget_berry.bind("<KeyRelease>", self._on_key_typed)
+        for key in self._LINE_KEYS:
+            self.text_widget_berry.bind(f"<KeyRelease-{key}>", self._on_cursor_move)
         self.text_widget_berry.bind("<ButtonRelease-1>", self._on_cursor_move)
-        self.text_widget_berry.bind("<Motion>", self._on_cursor_move)
+        for sequence in self._EDIT_EVENTS:
+            self.text_widget_berry.bind(sequence, self._on_text_edit)
+        
+        self._active_widget = self.text_widget
+        # Line currently carrying the "current_line" tag in each text widget
+        self._hl_line = {self.text_widget: None, self.text_widget_berry: None}
         
         # Bind tab change event
         self.notebook.bind("<<NotebookTabChanged>>", self.on_tab_change)
@@ -157,17 +197,43 @@ class SerialGUIApp:
         # Make status frame resizable with a separator
         separator = ttk.Separator(self.root, orient=tk.HORIZONTAL)
         separator.pack(side=tk.BOTTOM, fill=tk.X)
+        self._widgets_ready = True
         # Initialize current-line highlight
         self._on_cursor_move()
     
     def populate_ports(self):
         """Populate available serial ports"""
-        ports = [port.device for port in serial.tools.list_ports.comports()]
-        self.port_combo['values'] = ports
-        if ports:
-            self.port_combo.current(0)
-        else:
+        # Device enumeration can be slow, so do it off the GUI thread
+        threading.Thread(target=self._enum_ports, daemon=True).start()
+    
+    def _enum_ports(self):
+        """List serial ports in a separate thread"""
+        try:
+            from serial.tools import list_ports  # Imported lazily to keep startup fast
+            self._ports_result = tuple(port.device for port in list_ports.comports())
+            self._ports_error = None
+        except Exception as e:
+            self._ports_error = str(e)
+        self._post_event("<<PortsListed>>")
+    
+    def _apply_ports(self, event=None):
+        """Show the enumerated ports, leaving the combobox alone if nothing changed"""
+        if self._ports_error:
+            self._auto_connect_pending = False
+            self.set_status_message(f"Error listing serial ports: {self._ports_error}", "red")
+            return
+        ports = self._ports_result
+        if not ports:
             messagebox.showwarning("Warning", "No serial ports found")
+        if ports != self._last_ports:
+            self._last_ports = ports
+            self.port_combo['values'] = ports
+            # Keep the current selection if that port is still there
+            if ports and self.port_var.get() not in ports:
+                self.port_combo.current(0)
+        if self._auto_connect_pending:
+            self._auto_connect_pending = False
+            self.auto_connect()
     
     def toggle_connection(self):
         """Toggle serial connection"""
@@ -178,6 +244,8 @@ class SerialGUIApp:
     
     def connect(self):
         """Connect to serial port"""
+        if self._connecting or (self.ser and self.ser.is_open):
+            return
         port = self.port_var.get()
         baud = int(self.baud_var.get())
         
@@ -185,37 +253,83 @@ class SerialGUIApp:
             self.set_status_message("Error: Please select a port", "red")
             return
         
+        # Opening the port can block for a while, so do it off the GUI thread
+        self._connecting = True
+        self.connect_btn.config(state="disabled")
+        self.set_status_message(f"Connecting to {port}...")
+        threading.Thread(target=self._open_port, args=(port, baud), daemon=True).start()
+    
+    def _open_port(self, port, baud):
+        """Open the serial port in a separate thread"""
         try:
-            self.ser = serial.Serial(port, baud, timeout=1)
-            self.running = True
-            self.connect_btn.config(text="Disconnect")
-            self.status_label.config(text=f"Status: Connected to {port} at {baud} baud", foreground="green")
-            self.set_status_message(f"Connected to {port} at {baud} baud")
-            self.port_combo.config(state="disabled")
-            
-            # Save settings to shelve
-            self.config_db['last_port'] = port
-            self.config_db['last_baud'] = baud
-            self.config_db.sync()
-            
-            # Start reader thread
-            self.reader_thread = threading.Thread(target=self.read_serial_data, daemon=True)
-            self.reader_thread.start()
+            import serial  # Imported lazily to keep startup fast
+            # Short read timeout lets the reader thread notice disconnects promptly;
+            # the write timeout bounds how long a stalled device can block a send
+            ser = serial.Serial(port, baud, timeout=0.05, write_timeout=2.0)
         except Exception as e:
-            self.set_status_message(f"Error: Could not connect to port - {str(e)}", "red")
+            self._open_results.append(str(e))
+            self._post_event("<<SerialConnectFailed>>")
+            return
+        # Larger driver buffers for batched sends (only available on Windows)
+        if hasattr(ser, 'set_buffer_size'):
+            try:
+                ser.set_buffer_size(rx_size=1 << 16, tx_size=1 << 16)
+            except Exception:
+                pass
+        self._open_results.append((ser, port, baud))
+        self._post_event("<<SerialConnected>>")
+    
+    def _on_connected(self, event=None):
+        """Finish connecting once the port has been opened"""
+        self._connecting = False
+        self.ser, port, baud = self._open_results.popleft()
+        # Drop anything left over from a previous connection
+        self._decoder.reset()
+        self._held_cr = ""
+        self.connect_btn.config(text="Disconnect", state="normal")
+        self.status_label.config(text=f"Status: Connected to {port} at {baud} baud", foreground="green")
+        self.set_status_message(f"Connected to {port} at {baud} baud")
+        self.port_combo.config(state="disabled")
+        
+        # Save settings, touching the disk only when they changed
+        if self.config.get('last_port') != port or self.config.get('last_baud') != baud:
+            self.config['last_port'] = port
+            self.config['last_baud'] = baud
+            self._save_config()
+        
+        # Start reader thread
+        self.reader_thread = threading.Thread(target=self.read_serial_data, args=(self.ser,), daemon=True)
+        self.reader_thread.start()
+    
+    def _on_connect_failed(self, event=None):
+        """Report a failed connection attempt"""
+        self._connecting = False
+        error = self._open_results.popleft()
+        self.connect_btn.config(state="normal")
+        self.set_status_message(f"Error: Could not connect to port - {error}", "red")
     
     def disconnect(self):
         """Disconnect from serial port"""
+        if self.ser and self.ser.is_open:
+            # Clearing self.ser tells this connection's reader thread to stop
+            ser, self.ser = self.ser, None
+            threading.Thread(target=self._close_port, args=(ser,), daemon=True).start()
+            self.connect_btn.config(text="Connect")
+            self.status_label.config(text="Status: Disconnected", foreground="red")
+            self.set_status_message("Disconnected")
+            self.port_combo.config(state="readonly")
+    
+    def _close_port(self, ser):
+        """Close the serial port in a separate thread"""
         try:
-            if self.ser and self.ser.is_open:
-                self.running = False
-                self.ser.close()
-                self.connect_btn.config(text="Connect")
-                self.status_label.config(text="Status: Disconnected", foreground="red")
-                self.set_status_message("Disconnected")
-                self.port_combo.config(state="readonly")
+            ser.close()
         except Exception as e:
-            self.set_status_message(f"Error disconnecting: {str(e)}", "red")
+            self._close_error = str(e)
+            self._post_event("<<SerialCloseFailed>>")
+    
+    def _on_close_failed(self, event=None):
+        """Report an error raised while closing the port"""
+        self.set_status_message(f"Error disconnecting: {self._close_error}", "red")
     
     def send_selected_line(self):
         """Send selected line(s) to serial port"""
@@ -224,9 +338,7 @@ class SerialGUIApp:
             return
         
         try:
-            # Determine active text widget
-            active_tab = self.notebook.index(self.notebook.select())
-            text_widget = self.text_widget if active_tab == 0 else self.text_widget_berry
+            text_widget = self._active_widget
 
             # Try to get selected text; if none, use the line at cursor
             try:
@@ -237,26 +349,18 @@ class SerialGUIApp:
             if selected_text and selected_text.strip():
                 self._clear_statusbar()  # Clear serial output
                 lines = selected_text.split('\n')
-                count = 0
-                for line in lines:
-                    if line.strip():
-                        # Berry prefix if needed
-                        out = ("br " + line) if active_tab == 1 else line
-                        self.ser.write((out + '\n').encode('utf-8'))
-                        count += 1
+                payload, count = self._build_payload(lines)
+                self.ser.write(payload)
                 self.set_status_message(f"Sent {count} line(s)")
             else:
                 # Send current line at cursor
-                cursor_pos = text_widget.index(tk.INSERT)
-                line_num = int(cursor_pos.split('.')[0])
-                line_start = f"{line_num}.0"
-                line_end = f"{line_num}.end"
-                line_text = text_widget.get(line_start, line_end).strip()
+                line_text = text_widget.get("insert linestart", "insert lineend").strip()
                 if line_text:
                     self._clear_statusbar()
-                    out = ("br " + line_text) if active_tab == 1 else line_text
+                    out = ("br " + line_text) if self.berry_mode else line_text
                     self.ser.write((out + '\n').encode('utf-8'))
                     # highlight this line
+                    line_num = int(text_widget.index(tk.INSERT).split('.')[0])
                     self._highlight_line_in_widget(text_widget, line_num)
                     self.set_status_message("Line sent")
                 else:
@@ -271,27 +375,16 @@ class SerialGUIApp:
             return "break"
         
         try:
-            # Get the active text widget based on current tab
-            active_tab = self.notebook.index(self.notebook.select())
-            if active_tab == 0:  # Normal mode
-                text_widget = self.text_widget
-            else:  # Berry mode
-                text_widget = self.text_widget_berry
-            
-            # Get cursor position
-            cursor_pos = text_widget.index(tk.INSERT)
-            line_num = int(cursor_pos.split('.')[0])
+            text_widget = self._active_widget
             
             # Get the line at cursor position
-            line_start = f"{line_num}.0"
-            line_end = f"{line_num}.end"
-            line_text = text_widget.get(line_start, line_end).strip()
+            line_text = text_widget.get("insert linestart", "insert lineend").strip()
             
             if line_text:  # Only send if line has content
                 self._clear_statusbar()  # Clear serial output
                 
                 # Add "br " prefix in Berry mode
-                if active_tab == 1:  # Berry mode
+                if self.berry_mode:
                     line_text = "br " + line_text
                 
                 self.ser.write((line_text + '\n').encode('utf-8'))
@@ -310,18 +403,10 @@ class SerialGUIApp:
             return "break"
 
         try:
-            active_tab = self.notebook.index(self.notebook.select())
-            text_widget = self.text_widget if active_tab == 0 else self.text_widget_berry
-            text = text_widget.get(1.0, tk.END)
-            if text.strip():
+            payload, count = self._build_payload(self._iter_lines(self._active_widget))
+            if count:
                 self._clear_statusbar()  # Clear serial output
-                lines = text.split('\n')
-                count = 0
-                for line in lines:
-                    if line.strip():  # Skip empty lines
-                        out = ("br " + line) if active_tab == 1 else line
-                        self.ser.write((out + '\n').encode('utf-8'))
-                        count += 1
+                self.ser.write(payload)
                 self.set_status_message(f"Sent {count} line(s)")
             else:
                 self.set_status_message("Warning: Text area is empty", "orange")
@@ -329,15 +414,32 @@ class SerialGUIApp:
             self.set_status_message(f"Error: Could not send data - {str(e)}", "red")
         return "break"
     
+    def _iter_lines(self, widget):
+        """Yield the lines of a text widget without copying the whole buffer"""
+        last_line = int(widget.index("end-1c").split('.')[0])
+        for line_num in range(1, last_line + 1):
+            yield widget.get(f"{line_num}.0", f"{line_num}.end")
+    
+    def _build_payload(self, lines):
+        """Encode non-empty lines into one buffer so they go out in a single write"""
+        buf = bytearray()
+        count = 0
+        for line in lines:
+            if line.strip():  # Skip empty lines
+                if self.berry_mode:
+                    buf.extend(self._BR_PREFIX)
+                buf.extend(line.encode('utf-8'))
+                buf.extend(self._NL)
+                count += 1
+        return buf, count
+    
     def clear_text(self):
         """Clear the text widget"""
         # Clear the active tab's text widget
-        try:
-            active_tab = self.notebook.index(self.notebook.select())
-            widget = self.text_widget if active_tab == 0 else self.text_widget_berry
-            widget.delete(1.0, tk.END)
-        except Exception:
-            pass
+        if not self._widgets_ready:
+            return
+        self._active_widget.delete(1.0, tk.END)
+        self._hl_line[self._active_widget] = None
 
     def open_file(self):
         """Open a text file (starting in script dir) and load into active tab"""
@@ -356,9 +458,9 @@ class SerialGUIApp:
             with open(filepath, 'r', encoding='utf-8') as f:
                 content = f.read()
 
-            active_tab = self.notebook.index(self.notebook.select())
-            widget = self.text_widget if active_tab == 0 else self.text_widget_berry
+            widget = self._active_widget
             widget.delete(1.0, tk.END)
+            self._hl_line[widget] = None
             widget.insert(tk.END, content)
             self.set_status_message(f"Loaded file: {os.path.basename(filepath)}")
             # update highlight
@@ -378,103 +480,157 @@ class SerialGUIApp:
 
     def _highlight_line_in_widget(self, widget, line_num):
         """Highlight a specific line number in the given text widget"""
-        try:
-            widget.tag_remove("current_line", "1.0", tk.END)
-            start = f"{line_num}.0"
-            end = f"{line_num}.end"
-            widget.tag_add("current_line", start, end)
+        if not self._widgets_ready:
+            return
+        start = f"{line_num}.0"
+        # Include the newline so text typed at the end of the line inherits the tag
+        end = f"{line_num}.end+1c"
+        if self._hl_line.get(widget) != line_num:
+            # Only touch the range that is actually tagged instead of scanning the whole text
+            ranges = widget.tag_ranges("current_line")
+            if ranges:
+                widget.tag_remove("current_line", ranges[0], ranges[-1])
+            self._hl_line[widget] = line_num
+        # Always re-apply: text typed at the start of a line does not inherit the tag
+        widget.tag_add("current_line", start, end)
+        # Only scroll when the line is not already on screen
+        if widget.dlineinfo(start) is None:
             widget.see(start)
-        except Exception:
-            pass
 
     def _clear_line_highlights(self):
         """Clear highlights on both text widgets"""
-        try:
-            self.text_widget.tag_remove("current_line", "1.0", tk.END)
-        except Exception:
-            pass
-        try:
-            self.text_widget_berry.tag_remove("current_line", "1.0", tk.END)
-        except Exception:
-            pass
+        if not self._widgets_ready:
+            return
+        for widget in (self.text_widget, self.text_widget_berry):
+            widget.tag_remove("current_line", "1.0", tk.END)
+            self._hl_line[widget] = None
 
+    def _on_key_typed(self, event):
+        """Extend the highlight over text typed on the current line"""
+        if not self._widgets_ready:
+            return
+        event.widget.tag_add("current_line", "insert linestart", "insert lineend+1c")
+    
+    def _on_text_edit(self, event):
+        """Re-highlight after an edit that may have moved lines around"""
+        # Forget the cached line so the tag is applied again, and wait until
+        # the widget's class binding has actually performed the edit
+        self._hl_line[event.widget] = None
+        self.root.after_idle(self._on_cursor_move)
+    
     def _on_cursor_move(self, event=None):
         """Called when cursor moves or user clicks — highlight current line in the widget"""
-        widget = None
-        if event is not None and hasattr(event, 'widget'):
-            widget = event.widget
-        else:
-            # choose based on active tab
-            active_tab = self.notebook.index(self.notebook.select())
-            widget = self.text_widget if active_tab == 0 else self.text_widget_berry
-
-        try:
-            idx = widget.index(tk.INSERT)
-            line_num = int(idx.split('.')[0])
-            self._highlight_line_in_widget(widget, line_num)
-        except Exception:
-            pass
+        if not self._widgets_ready:
+            return
+        widget = event.widget if event is not None else self._active_widget
+        line_num = int(widget.index(tk.INSERT).split('.')[0])
+        self._highlight_line_in_widget(widget, line_num)
     
     def _update_statusbar(self, text):
         """Update the status bar text widget"""
         self.statusbar.config(state=tk.NORMAL)
         self.statusbar.insert(tk.END, text)
+        # Trim the oldest lines so long sessions stay responsive
+        line_count = int(self.statusbar.index("end-1c").split('.')[0])
+        if line_count > self.MAX_OUTPUT_LINES:
+            self.statusbar.delete("1.0", f"{line_count - self.MAX_OUTPUT_LINES + 1}.0")
         self.statusbar.see(tk.END)  # Auto-scroll to bottom
         self.statusbar.config(state=tk.DISABLED)
     
     def on_tab_change(self, event=None):
         """Handle tab change event"""
         active_tab = self.notebook.index(self.notebook.select())
-        if active_tab == 0:
-            self.berry_mode = False
-        else:
-            self.berry_mode = True
+        self.berry_mode = active_tab == 1
+        self._active_widget = self.text_widget_berry if self.berry_mode else self.text_widget
         # Update highlight for the newly selected tab
         self._on_cursor_move()
     
-    def monitor_queue(self):
-        """Monitor queue for any messages"""
-        # Process any data from the serial reader
+    def _drain_queue(self, event=None):
+        """Process any data queued by the serial reader"""
+        # Clear before draining so data queued from now on posts a new event
+        self._drain_pending = False
+        fragments = []
         try:
             while True:
-                data = self.queue.get_nowait()
-                self._update_statusbar(data + "\n")
-        except:
+                fragments.append(self.queue.popleft())
+        except IndexError:
             pass
-        
-        self.root.after(100, self.monitor_queue)
+        if fragments:
+            # Decode everything received since the last drain in one go
+            text = self._held_cr + self._decoder.decode(b"".join(fragments))
+            self._held_cr = ""
+            if text.endswith('\r'):
+                text, self._held_cr = text[:-1], '\r'
+            text = text.replace('\r\n', '\n')
+            if text:
+                self._update_statusbar(text)
     
-    def read_serial_data(self):
+    def _post_event(self, sequence):
+        """Signal the GUI thread with a virtual event (called from worker threads)"""
+        try:
+            self.root.event_generate(sequence, when="tail")
+        except (tk.TclError, RuntimeError):
+            # Window is being destroyed
+            pass
+    
+    def read_serial_data(self, ser):
         """Read data from serial port in a separate thread"""
-        while self.running and self.ser and self.ser.is_open:
+        # Each reader serves only its own port; once self.ser moves on (disconnect or
+        # a newer connection) it exits without touching the current session
+        while self.ser is ser and ser.is_open:
             try:
-                if self.ser.in_waiting > 0:
-                    data = self.ser.read(self.ser.in_waiting)
-                    text = data.decode('utf-8', errors='ignore').strip()
-                    if text:
-                        self.queue.put(text)
+                # Wait up to the read timeout for the first byte, then take
+                # everything the driver has already buffered in one call
+                data = ser.read(ser.in_waiting or 1)
+                if data and self.ser is ser:
+                    # Raw bytes are decoded on the GUI thread in _drain_queue
+                    self.queue.append(data)
+                    if not self._drain_pending:
+                        self._drain_pending = True
+                        self._post_event("<<SerialData>>")
             except Exception as e:
-                self.queue.put(f"Error reading: {str(e)}")
+                # Errors caused by disconnect() closing the port are expected
+                if self.ser is ser:
+                    self.queue.append(f"\nError reading: {str(e)}\n".encode('utf-8'))
+                    self._post_event("<<SerialData>>")
                 break
     
+    def _load_config(self):
+        """Load saved settings, returning an empty dict if there are none"""
+        try:
+            with open(self._config_path, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+    
+    def _save_config(self):
+        """Write settings atomically so a crash never leaves a partial file"""
+        tmp_path = self._config_path + '.tmp'
+        try:
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump(self.config, f)
+            os.replace(tmp_path, self._config_path)
+        except OSError as e:
+            self.set_status_message(f"Error saving settings: {str(e)}", "orange")
+    
     def on_closing(self):
         """Handle window closing"""
         if self.ser and self.ser.is_open:
-            self.disconnect()
-        if self.config_db:
-            self.config_db.close()
+            # Close synchronously so the port is released before exiting
+            ser, self.ser = self.ser, None
+            ser.close()
+        self._widgets_ready = False
         self.root.destroy()
     
     def auto_connect(self):
         """Auto-connect with saved settings if available"""
         try:
-            if 'last_port' in self.config_db and 'last_baud' in self.config_db:
-                last_port = self.config_db['last_port']
-                last_baud = self.config_db['last_baud']
+            if 'last_port' in self.config and 'last_baud' in self.config:
+                last_port = self.config['last_port']
+                last_baud = self.config['last_baud']
                 
                 # Check if the port still exists
-                available_ports = [port.device for port in serial.tools.list_ports.comports()]
-                if last_port in available_ports:
+                if last_port in self._ports_result:
                     self.port_var.set(last_port)
                     self.baud_var.set(str(last_baud))
                     self.connect()